@@ -1,16 +1,32 @@
 # Dynamic admin UI routes (session-based authentication).
-from fastapi import APIRouter, Request, Form
-from fastapi.responses import RedirectResponse
+import asyncio
+import datetime
+import json
+from fastapi import APIRouter, HTTPException, Request, Form
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from starlette.status import HTTP_302_FOUND
 from .admin_register import get_registered_models
 from .db import AsyncSessionLocal
 from . import crud
+from .notifications import ChangeEvent, broker
+from .query_plan import explain_statement
 from .security import verify_password
-from typing import Any
+from .static_assets import static_url, vendored_script
+from typing import Any, Optional
 
 router = APIRouter()
 templates = Jinja2Templates(directory="fastapi_admin/templates")
+# cache-busted URLs for the self-hosted CSS/JS used by base.html
+templates.env.globals["static_url"] = static_url
+templates.env.globals["vendored_script"] = vendored_script
+templates.env.globals["getattr"] = getattr
+
+# Seconds between SSE keep-alive comments on idle live list streams
+LIVE_KEEPALIVE_SECONDS = 15
+
+# Rows shown on a list page (the LIMIT of the list query)
+LIST_PAGE_SIZE = 100
 
 
 # helper to fetch current user from session cookie
@@ -60,6 +76,50 @@ async def admin_index(request: Request):
     )
 
 
+def _coerce(column: Any, value: str) -> Any:
+    """
+    Convert a query-string value to the column's Python type.
+    Raises ValueError if the value is not valid for the column.
+    """
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is str:
+        return value
+    if python_type is bool:
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    if python_type in (datetime.date, datetime.datetime, datetime.time):
+        return python_type.fromisoformat(value)
+    try:
+        return python_type(value)
+    except (TypeError, ArithmeticError) as e:  # e.g. decimal.InvalidOperation
+        raise ValueError(str(e)) from e
+
+
+def _list_params(request: Request, model: Any) -> tuple[dict, Optional[str]]:
+    """
+    Read the list page filters (?<column>=value) and sort (?sort=[-]column)
+    from the query string.
+    """
+    columns = model.__table__.columns
+    filters = {}
+    for name, value in request.query_params.items():
+        if name not in columns or name == "sort":
+            continue
+        try:
+            filters[name] = _coerce(columns[name], value)
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid value for {name}: {value!r}"
+            )
+    return filters, request.query_params.get("sort")
+
+
 # List records for model
 @router.get("/admin/model/{model_name}")
 async def list_records(request: Request, model_name: str):
@@ -70,8 +130,16 @@ async def list_records(request: Request, model_name: str):
     model = models.get(model_name)
     if not model:
         return RedirectResponse("/admin")
+    pk_col = None
+    for c in model.__table__.columns:
+        if c.primary_key:
+            pk_col = c.name
+            break
+    filters, sort = _list_params(request, model)
     async with AsyncSessionLocal() as db:
-        records = await crud.list_model(db, model)
+        records = await crud.list_model(
+            db, model, limit=LIST_PAGE_SIZE, filters=filters, order_by=sort
+        )
     return templates.TemplateResponse(
         "admin_list.html",
         {
@@ -79,10 +147,180 @@ async def list_records(request: Request, model_name: str):
             "model": model,
             "records": records,
             "model_name": model_name,
+            "pk_col": pk_col,
+            "sort": sort,
+            "page_size": LIST_PAGE_SIZE,
+        },
+    )
+
+
+# Query plan of the list page (same filters/sort as the list URL)
+@router.get("/admin/model/{model_name}/explain")
+async def explain_list(request: Request, model_name: str):
+    user = await get_current_user(request)
+    if not user or not user.is_superuser:
+        return RedirectResponse("/admin/login")
+    models = get_registered_models()
+    model = models.get(model_name)
+    if not model:
+        return RedirectResponse("/admin")
+    filters, sort = _list_params(request, model)
+    # the exact statement list_records() runs for this query string
+    stmt = crud.list_model_query(model, filters=filters, order_by=sort)
+    async with AsyncSessionLocal() as db:
+        plan = await explain_statement(db, model, stmt, filters, sort)
+    return templates.TemplateResponse(
+        "admin_explain.html",
+        {
+            "request": request,
+            "model": model,
+            "model_name": model_name,
+            "plan": plan,
         },
     )
 
 
+async def _notify(model_name: str, op: str, pk: Any) -> None:
+    """
+    Publish a change for live list pages. Best effort: the write has already
+    been committed, so a failing notification must not fail the request.
+    """
+    try:
+        await broker.publish(model_name, op, pk)
+    except Exception as e:
+        print(f"[live] ⚠️ failed to publish {op} of {model_name} {pk}: {e}")
+
+
+def _sse(event: str, data: str) -> str:
+    # every line of a multi-line payload needs its own "data:" prefix
+    lines = "\n".join(f"data: {line}" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n\n"
+
+
+async def _render_row(
+    model: Any, model_name: str, pk_col: str, pk: Any, filters: dict
+) -> str:
+    """
+    Render the list row for a single record, or "" if it no longer exists
+    or does not match the page's filters.
+    """
+    q = crud.list_model_query(model, filters=filters).where(
+        model.__table__.columns[pk_col] == pk
+    )
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(q)
+        instance = res.scalars().first()
+    if instance is None:
+        return ""
+    return templates.get_template("admin_list_row.html").render(
+        rec=instance, model=model, model_name=model_name, pk_col=pk_col
+    )
+
+
+async def _sorted_window(
+    model: Any, pk_col: str, filters: dict, sort: str
+) -> list[str]:
+    """
+    Primary keys (as strings) of the rows a sorted list page shows, in order.
+    """
+    q = crud.list_model_query(
+        model, limit=LIST_PAGE_SIZE, filters=filters, order_by=sort
+    ).with_only_columns(model.__table__.columns[pk_col])
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(q)
+        return [str(pk) for pk in res.scalars().all()]
+
+
+async def _shared(change: ChangeEvent, key: tuple, factory) -> Any:
+    # All local subscribers receive the same ChangeEvent, so the row render /
+    # sorted window is computed once per change and list view, not once per page.
+    task = change.shared.get(key)
+    if task is None:
+        task = change.shared[key] = asyncio.ensure_future(factory())
+    # shield: a subscriber disconnecting must not cancel the shared work
+    return await asyncio.shield(task)
+
+
+# Live updates for an open list page (server-sent events, see admin_live.js)
+@router.get("/admin/model/{model_name}/events")
+async def list_events(request: Request, model_name: str):
+    user = await get_current_user(request)
+    if not user or not user.is_superuser:
+        return RedirectResponse("/admin/login")
+    models = get_registered_models()
+    model = models.get(model_name)
+    if not model:
+        return RedirectResponse("/admin")
+    pk_col = None
+    for c in model.__table__.columns:
+        if c.primary_key:
+            pk_col = c.name
+            break
+    # same filters/sort as the list page that opened the stream
+    filters, sort = _list_params(request, model)
+    filter_key = tuple(sorted(filters.items()))
+
+    async def row_html(change: ChangeEvent) -> str:
+        return await _shared(
+            change,
+            ("row", filter_key),
+            lambda: _render_row(model, model_name, pk_col, change.pk, filters),
+        )
+
+    async def sorted_event(change: ChangeEvent) -> str:
+        # Only pages that show the row, or that it moves into, need to reload;
+        # the client compares the row's new index with its current position.
+        window = await _shared(
+            change,
+            ("window", filter_key, sort),
+            lambda: _sorted_window(model, pk_col, filters, sort),
+        )
+        pk = str(change.pk)
+        index = window.index(pk) if pk in window else -1
+        html = await row_html(change) if index >= 0 else ""
+        return json.dumps({"pk": pk, "index": index, "html": html})
+
+    async def stream():
+        async with broker.subscribe(model_name) as subscription:
+            yield "retry: 5000\n\n"
+            while True:
+                change = await subscription.get(LIVE_KEEPALIVE_SECONDS)
+                if subscription.overflowed:
+                    yield _sse("resync", "reload")
+                    return
+                if change is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                if change.op == "delete":
+                    yield _sse("delete", str(change.pk))
+                    continue
+                try:
+                    if sort:
+                        yield _sse("sorted", await sorted_event(change))
+                        continue
+                    html = await row_html(change)
+                except Exception as e:
+                    # the shared render failed for every open page; let them reload
+                    print(f"[live] ⚠️ failed to render {model_name} row {change.pk}: {e}")
+                    yield _sse("resync", "reload")
+                    return
+                if html:
+                    # create: appended while the page is below its limit
+                    # update: replaces the row only if the page shows it
+                    yield _sse(change.op, html)
+                else:
+                    # deleted meanwhile, or no longer matches the page's filters
+                    yield _sse("delete", str(change.pk))
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Add record (GET form)
 @router.get("/admin/model/{model_name}/add")
 async def add_record_form(request: Request, model_name: str):
@@ -124,7 +362,13 @@ async def add_record(request: Request, model_name: str):
         if v == "":
             data[k] = None
     async with AsyncSessionLocal() as db:
-        await crud.create_model_instance(db, model, data)
+        instance = await crud.create_model_instance(db, model, data)
+    pk_col = None
+    for c in model.__table__.columns:
+        if c.primary_key:
+            pk_col = c.name
+            break
+    await _notify(model_name, "create", getattr(instance, pk_col))
     return RedirectResponse(f"/admin/model/{model_name}", status_code=HTTP_302_FOUND)
 
 
@@ -187,6 +431,7 @@ async def edit_record(request: Request, model_name: str, pk: int):
                 f"/admin/model/{model_name}", status_code=HTTP_302_FOUND
             )
         await crud.update_model_instance(db, instance, data)
+    await _notify(model_name, "update", pk)
     return RedirectResponse(f"/admin/model/{model_name}", status_code=HTTP_302_FOUND)
 
 
@@ -209,4 +454,6 @@ async def delete_record(request: Request, model_name: str, pk: int):
         instance = await crud.get_model_instance(db, model, pk_col, pk)
         if instance:
             await crud.delete_model_instance(db, instance)
+    if instance:
+        await _notify(model_name, "delete", pk)
     return RedirectResponse(f"/admin/model/{model_name}", status_code=HTTP_302_FOUND)
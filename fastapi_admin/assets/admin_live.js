@@ -0,0 +1,105 @@
+/*
+ * Live list updates for admin_list.html.
+ *
+ * Subscribes to the model's server-sent event stream and swaps only the rows
+ * that changed, instead of the page being refreshed and the list re-queried.
+ *   create -> data is a rendered <tr id="row-<pk>">; appended while the page
+ *             is below its limit, otherwise the page reloads
+ *   update -> data is a rendered row; replaces the row only if it is shown
+ *   delete -> data is the primary key of the removed row
+ *   sorted -> (sorted pages) JSON {pk, index, html}: the row's position in the
+ *             sorted window (-1 if outside); the page reloads only if the row
+ *             is shown or moves into the window
+ *   resync -> this page missed changes; reload it
+ * Reloads are staggered so open pages don't all re-run the list query at once.
+ */
+(function () {
+    var RESYNC_JITTER_MS = 5000;
+
+    var tbody = document.getElementById("admin-rows");
+    if (!tbody || !window.EventSource) {
+        return;
+    }
+    var limit = parseInt(tbody.dataset.pageLimit, 10) || Infinity;
+    var source = new EventSource(tbody.dataset.liveUrl);
+    var reloading = false;
+
+    function resync() {
+        if (reloading) {
+            return;
+        }
+        reloading = true;
+        source.close();
+        setTimeout(function () {
+            window.location.reload();
+        }, Math.random() * RESYNC_JITTER_MS);
+    }
+
+    function parseRow(html) {
+        var template = document.createElement("template");
+        template.innerHTML = html.trim();
+        return template.content.firstElementChild;
+    }
+
+    function swap(existing, row) {
+        existing.replaceWith(row);
+        if (window.htmx) {
+            window.htmx.process(row);
+        }
+    }
+
+    source.addEventListener("create", function (event) {
+        var row = parseRow(event.data);
+        if (!row) {
+            return;
+        }
+        var existing = document.getElementById(row.id);
+        if (existing) {
+            swap(existing, row);
+        } else if (tbody.children.length < limit) {
+            tbody.appendChild(row);
+            if (window.htmx) {
+                window.htmx.process(row);
+            }
+        } else {
+            resync();
+        }
+    });
+
+    source.addEventListener("update", function (event) {
+        var row = parseRow(event.data);
+        var existing = row && document.getElementById(row.id);
+        if (existing) {
+            swap(existing, row);
+        }
+    });
+
+    source.addEventListener("delete", function (event) {
+        var existing = document.getElementById("row-" + event.data);
+        if (existing) {
+            existing.remove();
+        }
+    });
+
+    source.addEventListener("sorted", function (event) {
+        var change = JSON.parse(event.data);
+        var existing = document.getElementById("row-" + change.pk);
+        if (change.index < 0) {
+            // outside the window: only matters if it just left this page
+            if (existing) {
+                resync();
+            }
+            return;
+        }
+        var position = existing
+            ? Array.prototype.indexOf.call(tbody.children, existing)
+            : -1;
+        if (position === change.index) {
+            swap(existing, parseRow(change.html));
+        } else {
+            resync();
+        }
+    });
+
+    source.addEventListener("resync", resync);
+})();
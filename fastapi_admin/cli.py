@@ -2,6 +2,7 @@ import typer
 import asyncio
 from .db import AsyncSessionLocal, init_db
 from . import crud
+from .static_assets import build_static, vendor_assets
 
 # Create a Typer app (the CLI application)
 app = typer.Typer()
@@ -65,6 +66,30 @@ def createsuperuser(
     asyncio.run(_create())
 
 
+@app.command()
+def collectstatic(
+    download: bool = typer.Option(
+        True, help="Download missing vendored assets (disable when air-gapped)."
+    ),
+):
+    """
+    Build the admin static files (like Django's collectstatic).
+    Checks the vendored third-party assets against their pinned hashes, writes
+    content-hashed copies of everything in fastapi_admin/assets/ to
+    fastapi_admin/static/ together with gzip/brotli variants and a manifest.json
+    used by the `static_url()` template helper.
+    Exits with code 1 if a vendored asset is missing or does not match its hash.
+    """
+    errors = vendor_assets(download=download)
+    if errors:
+        for error in errors:
+            typer.echo(f"Error: {error}", err=True)
+        raise typer.Exit(code=1)
+    manifest = build_static()
+    for name, hashed in manifest.items():
+        typer.echo(f"{name} -> {hashed}")
+
+
 # Run the Typer CLI app if executed directly
 if __name__ == "__main__":
     app()
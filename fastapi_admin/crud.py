@@ -2,6 +2,7 @@
 from typing import Any, Optional, List
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from .models import User
 from .security import hash_password
 
@@ -49,10 +50,42 @@ async def create_user(
 
 
 # Generic helpers for dynamic models (list/find/create/update/delete)
+def list_model_query(
+    model: Any,
+    limit: int = 100,
+    offset: int = 0,
+    filters: Optional[dict] = None,
+    order_by: Optional[str] = None,
+) -> Select:
+    """
+    Build the SELECT used by the admin list page.
+
+    filters: {column name: value} equality filters.
+    order_by: column name, prefixed with "-" for descending order.
+    Unknown column names are ignored.
+    """
+    columns = model.__table__.columns
+    q = select(model)
+    for name, value in (filters or {}).items():
+        if name in columns:
+            q = q.where(columns[name] == value)
+    if order_by:
+        name = order_by.lstrip("-")
+        if name in columns:
+            column = columns[name]
+            q = q.order_by(column.desc() if order_by.startswith("-") else column)
+    return q.offset(offset).limit(limit)
+
+
 async def list_model(
-    db: AsyncSession, model: Any, limit: int = 100, offset: int = 0
+    db: AsyncSession,
+    model: Any,
+    limit: int = 100,
+    offset: int = 0,
+    filters: Optional[dict] = None,
+    order_by: Optional[str] = None,
 ) -> List[Any]:
-    q = select(model).offset(offset).limit(limit)
+    q = list_model_query(model, limit, offset, filters, order_by)
     res = await db.execute(q)
     return res.scalars().all()
 
@@ -1,16 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-# from . import admin_routes, api_routes
-import sys, os
+import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils_autodiscover import autodiscover_models
-from admin_routes import router as admin_router
-from api_routes import router as api_router
-from db import init_db
+from .utils_autodiscover import autodiscover_models
+from .admin_routes import router as admin_router
+from .api_routes import router as api_router
+from .db import init_db
+from .notifications import broker
+from .static_assets import (
+    PrecompressedStaticFiles,
+    STATIC_DIR,
+    static_url,
+    vendored_script,
+)
 
 
 @asynccontextmanager
@@ -19,14 +24,17 @@ async def lifespan(app: FastAPI):
     # ✅ Startup
     await init_db()
     print("✅ Database initialized")
+    # LISTEN connection for live list updates (no-op for the in-memory broker)
+    await broker.start()
     yield  # 🔸 Application runs here
     # 🧹 Shutdown
+    await broker.stop()
     print("🛑 Application shutting down...")
 
 
 def create_app(module_paths: list[str] | None = None) -> FastAPI:
     # Create the main FastAPI application instance
-    app = FastAPI(title="fastapi-admin"و lifespan=lifespan)
+    app = FastAPI(title="fastapi-admin", lifespan=lifespan)
 
     # Load secret key from environment variable (or fallback to a default)
     # This secret key is used for session encryption
@@ -39,9 +47,15 @@ def create_app(module_paths: list[str] | None = None) -> FastAPI:
     # mount static & templates
     # Configure Jinja2 templates (used to render HTML templates)
     templates = Jinja2Templates(directory="fastapi_admin/templates")
-
-    # Serve static files (CSS, JS, images) from the /static path
-    app.mount("/static", StaticFiles(directory="fastapi_admin/static"), name="static")
+    templates.env.globals["static_url"] = static_url
+    templates.env.globals["vendored_script"] = vendored_script
+
+    # Serve the prebuilt static files (CSS, JS) from the /static path.
+    # Hashed files get far-future caching and .br/.gz variants are negotiated
+    # via Accept-Encoding (see static_assets.py / `cli.py collectstatic`).
+    app.mount(
+        "/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static"
+    )
 
     # autodiscover models specified by the consumer app
     if module_paths:
@@ -0,0 +1,244 @@
+# Change-notification channel used to push live updates to open admin list pages.
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .db import DATABASE_URL, engine
+
+try:  # asyncpg is only needed for the Postgres LISTEN/NOTIFY backend
+    import asyncpg
+except ImportError:  # pragma: no cover
+    asyncpg = None
+
+# Postgres channel shared by every admin worker
+CHANNEL = "fastapi_admin_changes"
+
+# Pending changes buffered per subscriber before it is considered too slow
+SUBSCRIBER_QUEUE_SIZE = 64
+
+# Backoff (seconds) between attempts to re-open a dropped LISTEN connection
+RECONNECT_DELAYS = (0, 1, 2, 5, 10, 30)
+
+
+@dataclass(eq=False)
+class ChangeEvent:
+    """
+    A single create/update/delete on a registered model.
+
+    The same instance is handed to every local subscriber of `model`, so
+    `shared` can be used to compute per-change work (rendered rows, sorted
+    windows) once for all of them, keyed by the subscribers' list parameters.
+    """
+
+    model: str
+    op: str  # "create" | "update" | "delete"
+    pk: Any
+    shared: dict[Any, asyncio.Future] = field(default_factory=dict, repr=False)
+
+
+class Subscription:
+    """
+    One open list page. Holds a small bounded queue; a subscriber that falls
+    behind is flagged as `overflowed` instead of blocking the publisher.
+    """
+
+    def __init__(self, model: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.model = model
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def put(self, change: ChangeEvent) -> None:
+        try:
+            self._queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def resync(self) -> None:
+        """
+        Changes may have been missed: flag the subscription and wake its reader.
+        """
+        self.overflowed = True
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout: float) -> Optional[ChangeEvent]:
+        """
+        Wait for the next change; return None if nothing arrived within `timeout`
+        (callers use that to send a keep-alive).
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryChangeBroker:
+    """
+    Process-local fan-out. Suitable for tests, SQLite and single-worker deployments.
+
+    Idle subscribers cost one small queue each and no background task;
+    publishing is a dict lookup plus a `put_nowait` per subscriber of that model.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, model: str, op: str, pk: Any) -> None:
+        self._dispatch(ChangeEvent(model=model, op=op, pk=pk))
+
+    def _ensure_listening(self) -> None:
+        pass
+
+    def _dispatch(self, change: ChangeEvent) -> None:
+        for subscription in list(self._subscribers.get(change.model, ())):
+            subscription.put(change)
+
+    def _resync_all(self) -> None:
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.resync()
+
+    @asynccontextmanager
+    async def subscribe(self, model: str) -> AsyncIterator[Subscription]:
+        # never connect inline: this runs after the SSE headers were sent
+        self._ensure_listening()
+        subscription = Subscription(model)
+        self._subscribers.setdefault(model, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(model)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[model]
+
+
+class PostgresChangeBroker(InMemoryChangeBroker):
+    """
+    Cross-worker fan-out over Postgres LISTEN/NOTIFY.
+
+    Each worker keeps a single LISTEN connection and dispatches notifications to
+    its local subscribers; publishing sends NOTIFY through the regular engine, so
+    the publishing worker receives its own change back like everyone else.
+    """
+
+    def __init__(self, dsn: str, engine: AsyncEngine, channel: str = CHANNEL):
+        super().__init__()
+        self.dsn = dsn
+        self.engine = engine
+        self.channel = channel
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._stopped = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._stopped = False
+        if self._conn is not None:
+            return
+        async with self._lock:
+            if self._conn is not None:
+                return
+            conn = await asyncpg.connect(self.dsn)
+            await conn.add_listener(self.channel, self._on_notify)
+            conn.add_termination_listener(self._on_terminate)
+            self._conn = conn
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+    async def publish(self, model: str, op: str, pk: Any) -> None:
+        payload = json.dumps({"model": model, "op": op, "pk": pk}, default=str)
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    def _on_notify(self, conn, pid, channel, payload) -> None:
+        try:
+            data = json.loads(payload)
+            change = ChangeEvent(model=data["model"], op=data["op"], pk=data["pk"])
+        except (ValueError, KeyError) as e:
+            print(f"[notifications] ⚠️ ignoring malformed payload {payload!r}: {e}")
+            return
+        self._dispatch(change)
+
+    def _ensure_listening(self, resync: bool = False) -> None:
+        # (re)connecting is owned by a single background task with backoff
+        if self._conn is None and self._reconnect_task is None and not self._stopped:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect(resync))
+
+    def _on_terminate(self, conn) -> None:
+        if self._conn is not conn:
+            return
+        self._conn = None
+        # notifications sent while the connection was down are lost:
+        # tell every open page to reload, then listen again right away
+        self._resync_all()
+        self._ensure_listening(resync=True)
+
+    async def _reconnect(self, resync: bool) -> None:
+        try:
+            attempt = 0
+            while not self._stopped and self._conn is None:
+                delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+                await asyncio.sleep(delay)
+                try:
+                    await self.start()
+                except Exception as e:
+                    print(f"[notifications] ⚠️ LISTEN reconnect failed: {e}")
+                attempt += 1
+            if resync and self._conn is not None:
+                # pages (re)loaded while we were not listening missed changes too
+                self._resync_all()
+        finally:
+            self._reconnect_task = None
+
+
+def create_broker(
+    database_url: str = DATABASE_URL, engine: AsyncEngine = engine
+) -> InMemoryChangeBroker:
+    """
+    Pick the change broker for this database.
+
+    Postgres (with asyncpg installed) uses LISTEN/NOTIFY so every worker sees every
+    change; anything else falls back to the in-memory broker. Set
+    ADMIN_CHANGE_BROKER=memory to force the in-memory broker.
+    """
+    url = make_url(database_url)
+    backend = os.getenv("ADMIN_CHANGE_BROKER", "auto")
+    if (
+        backend != "memory"
+        and url.get_backend_name() == "postgresql"
+        and asyncpg is not None
+    ):
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresChangeBroker(dsn, engine)
+    return InMemoryChangeBroker()
+
+
+# Broker shared by the admin write paths and the live list endpoint
+broker = create_broker()
@@ -0,0 +1,236 @@
+# Query-plan inspector for the admin list page (EXPLAIN + index suggestions).
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Tables with at least this many rows are "large" for the purpose of warnings
+LARGE_TABLE_ROWS = 10_000
+
+# SQLite EXPLAIN QUERY PLAN details
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+_SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (?:.*)ORDER BY")
+
+
+@dataclass
+class QueryPlan:
+    """
+    Result of explaining one statement.
+
+    lines: the plan, one node per line (indented by depth)
+    warnings: sequential scans / sorts on large tables
+    suggestions: candidate CREATE INDEX statements
+    """
+
+    dialect: str
+    sql: str
+    lines: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    suggestions: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+    sorts: list[str] = field(default_factory=list)
+
+
+def compile_statement(stmt: Select, dialect) -> str:
+    """
+    Render `stmt` as literal SQL for `dialect`, exactly as the list handler runs it.
+    """
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def explain_statement(
+    db: AsyncSession,
+    model: Any,
+    stmt: Select,
+    filters: Optional[dict] = None,
+    order_by: Optional[str] = None,
+) -> QueryPlan:
+    """
+    Run EXPLAIN for `stmt` and collect warnings and index suggestions.
+
+    Postgres: EXPLAIN (ANALYZE, BUFFERS) - the statement is executed, inside a
+    transaction that is rolled back afterwards.
+    SQLite: EXPLAIN QUERY PLAN.
+    Other dialects: only the compiled SQL is returned.
+
+    `filters` / `order_by` are the list-page arguments used to build `stmt`;
+    they tell the index suggestions which columns the query depends on.
+    Without either, the list query is a plain scan stopped early by its LIMIT,
+    so no warnings are raised.
+    """
+    dialect = db.bind.dialect
+    plan = QueryPlan(dialect=dialect.name, sql=compile_statement(stmt, dialect))
+
+    if dialect.name == "postgresql":
+        await _explain_postgres(db, plan)
+    elif dialect.name == "sqlite":
+        await _explain_sqlite(db, plan)
+    else:
+        plan.lines.append(f"EXPLAIN is not supported for dialect '{dialect.name}'.")
+        return plan
+
+    table = model.__table__
+    sort_column = (order_by or "").lstrip("-")
+    if not filters and sort_column not in table.columns:
+        return plan
+    rows = await _table_rows(db, table)
+    if rows is None:
+        plan.lines.append(
+            f"Row count of {table.name} is unknown (never analyzed?); "
+            "run ANALYZE for size-based warnings."
+        )
+        return plan
+    if rows < LARGE_TABLE_ROWS:
+        return plan
+    if table.name in plan.seq_scans:
+        plan.warnings.append(f"Sequential scan on {table.name} (~{rows} rows).")
+    if plan.sorts:
+        plan.warnings.append(
+            f"Sort on {table.name} (~{rows} rows) without a usable index."
+        )
+    if plan.warnings:
+        plan.suggestions = suggest_indexes(table, dialect, filters, order_by)
+    return plan
+
+
+async def _exec_sql(db: AsyncSession, sql: str):
+    # The SQL has its values rendered inline; run it as-is so that text such as
+    # ":word" inside a string literal is not parsed as a bind parameter.
+    conn = await db.connection()
+    return await conn.exec_driver_sql(sql)
+
+
+async def _explain_postgres(db: AsyncSession, plan: QueryPlan) -> None:
+    res = await _exec_sql(db, "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + plan.sql)
+    data = res.scalar()
+    # EXPLAIN ANALYZE really runs the statement; never keep its side effects
+    await db.rollback()
+    if isinstance(data, str):
+        data = json.loads(data)
+    top = data[0]
+    _walk_postgres(top["Plan"], plan, depth=0)
+    plan.lines.append(
+        f"Planning: {top.get('Planning Time', 0):.3f} ms, "
+        f"Execution: {top.get('Execution Time', 0):.3f} ms"
+    )
+
+
+def _walk_postgres(node: dict, plan: QueryPlan, depth: int) -> None:
+    node_type = node["Node Type"]
+    relation = node.get("Relation Name")
+    label = node_type + (f" on {relation}" if relation else "")
+    if node.get("Index Name"):
+        label += f" using {node['Index Name']}"
+    if node.get("Sort Key"):
+        label += f" (sort key: {', '.join(node['Sort Key'])})"
+    details = [
+        f"cost={node.get('Startup Cost', 0)}..{node.get('Total Cost', 0)}",
+        f"actual rows={node.get('Actual Rows', 0)}",
+        f"time={node.get('Actual Total Time', 0)} ms",
+        f"buffers hit={node.get('Shared Hit Blocks', 0)} "
+        f"read={node.get('Shared Read Blocks', 0)}",
+    ]
+    plan.lines.append("  " * depth + f"-> {label} ({', '.join(details)})")
+
+    if node_type == "Seq Scan" and relation:
+        plan.seq_scans.append(relation)
+    if node_type in ("Sort", "Incremental Sort"):
+        plan.sorts.append(", ".join(node.get("Sort Key", [])))
+    for child in node.get("Plans", []):
+        _walk_postgres(child, plan, depth + 1)
+
+
+async def _explain_sqlite(db: AsyncSession, plan: QueryPlan) -> None:
+    res = await _exec_sql(db, "EXPLAIN QUERY PLAN " + plan.sql)
+    depth: dict[int, int] = {}
+    for node_id, parent, _, detail in res.all():
+        depth[node_id] = depth.get(parent, -1) + 1
+        plan.lines.append("  " * depth[node_id] + f"-> {detail}")
+        match = _SQLITE_SCAN.match(detail)
+        if match:
+            plan.seq_scans.append(match.group(1))
+        if _SQLITE_SORT.search(detail):
+            plan.sorts.append(detail)
+
+
+async def _table_rows(db: AsyncSession, table) -> Optional[int]:
+    """
+    Cheap row-count estimate for `table`, or None if unknown.
+    """
+    dialect = db.bind.dialect
+    # schema-qualified and quoted as needed, e.g. "sales"."OrderLine"
+    quoted = dialect.identifier_preparer.format_table(table)
+    if dialect.name == "postgresql":
+        res = await db.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:name)"
+            ),
+            {"name": quoted},
+        )
+        rows = res.scalar()
+        # -1 means the table has never been analyzed
+        return rows if rows is not None and rows >= 0 else None
+    # bounded count: stop once we know the table is large
+    res = await _exec_sql(
+        db, f"SELECT COUNT(*) FROM (SELECT 1 FROM {quoted} LIMIT {LARGE_TABLE_ROWS})"
+    )
+    return res.scalar()
+
+
+def existing_indexes(table) -> list[tuple[str, ...]]:
+    """
+    Column tuples of every index the model's table already has
+    (explicit indexes, unique constraints and the primary key).
+    """
+    found = [tuple(c.name for c in index.columns) for index in table.indexes]
+    for constraint in table.constraints:
+        if not isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+            continue
+        columns = tuple(c.name for c in constraint.columns)
+        if columns and columns not in found:
+            found.append(columns)
+    return found
+
+
+def suggest_indexes(
+    table, dialect, filters: Optional[dict] = None, order_by: Optional[str] = None
+) -> list[str]:
+    """
+    Suggest a CREATE INDEX that lets the list query avoid the scan/sort:
+    equality-filtered columns first (in any order), then the sort column.
+    Nothing is suggested if an existing index already starts that way.
+    """
+    equality = [name for name in (filters or {}) if name in table.columns]
+    sort_column = (order_by or "").lstrip("-")
+    if sort_column not in table.columns or sort_column in equality:
+        sort_column = ""
+    wanted = equality + ([sort_column] if sort_column else [])
+    if not wanted:
+        return [
+            f"-- {table.name}: the list query has no filter or sort, "
+            "so no index can avoid reading the table."
+        ]
+
+    for columns in existing_indexes(table):
+        prefix = columns[: len(equality)]
+        if set(prefix) != set(equality):
+            continue
+        if not sort_column or columns[len(equality) : len(equality) + 1] == (
+            sort_column,
+        ):
+            return [
+                f"-- index on ({', '.join(columns)}) already exists; "
+                "the planner is not using it (stale statistics? run ANALYZE)."
+            ]
+
+    preparer = dialect.identifier_preparer
+    name = f"ix_{table.name}_{'_'.join(wanted)}"
+    return [
+        f"CREATE INDEX {preparer.quote(name)} ON {preparer.format_table(table)} "
+        f"({', '.join(preparer.quote(c) for c in wanted)});"
+    ]
@@ -0,0 +1,284 @@
+# Self-hosted static assets: build step (hash + precompress) and the StaticFiles app that serves them.
+import base64
+import gzip
+import hashlib
+import json
+import os
+import stat
+import urllib.request
+from functools import lru_cache
+from mimetypes import guess_type
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:  # brotli is optional, gzip variants are always produced
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Source assets (committed, edited by hand or vendored)
+ASSETS_DIR = os.path.join(PACKAGE_DIR, "assets")
+# Build output served under STATIC_URL (content-hashed + precompressed)
+STATIC_DIR = os.path.join(PACKAGE_DIR, "static")
+STATIC_URL = "/static/"
+MANIFEST_NAME = "manifest.json"
+
+# Third-party files vendored into ASSETS_DIR: name -> (source URL, pinned SRI hash).
+# Commit the downloaded file; the hash is checked on every build.
+VENDORED_ASSETS = {
+    "htmx.min.js": (
+        "https://unpkg.com/htmx.org@1.9.2/dist/htmx.min.js",
+        "sha384-L6OqL9pRWyyFU3+/bjdSri+iIphTN/bvYyM37tICVyOJkWZLpP2vGn6VUEXgzg6h",
+    ),
+}
+
+# Only text-like assets are worth precompressing
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+
+# Precompressed variants, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """
+    Return `name` with a short content hash inserted before the extension,
+    e.g. "admin.css" -> "admin.3f2a1b9c.css".
+    """
+    root, ext = os.path.splitext(name)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{root}.{digest}{ext}"
+
+
+def sri_hash(content: bytes) -> str:
+    """
+    Subresource-integrity style SHA-384 hash, e.g. "sha384-<base64>".
+    """
+    return "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode()
+
+
+def vendor_assets(assets_dir: str = ASSETS_DIR, download: bool = True) -> list[str]:
+    """
+    Make sure every asset in VENDORED_ASSETS is present in `assets_dir` and matches
+    its pinned hash. Missing files are downloaded when `download` is true.
+
+    Returns a list of error messages (empty if everything is in place).
+    """
+    errors = []
+    for name, (url, integrity) in VENDORED_ASSETS.items():
+        target = os.path.join(assets_dir, name)
+        if os.path.exists(target):
+            with open(target, "rb") as f:
+                content = f.read()
+            source = target
+        elif not download:
+            errors.append(f"{name} is missing from {assets_dir}")
+            continue
+        else:
+            try:
+                with urllib.request.urlopen(url, timeout=30) as resp:
+                    content = resp.read()
+            except OSError as e:
+                errors.append(f"{name} is missing and could not be downloaded: {e}")
+                continue
+            source = url
+
+        if sri_hash(content) != integrity:
+            errors.append(f"{name} from {source} does not match {integrity}")
+            continue
+        if source == url:
+            with open(target, "wb") as f:
+                f.write(content)
+    return errors
+
+
+def build_static(
+    assets_dir: str = ASSETS_DIR, static_dir: str = STATIC_DIR
+) -> dict[str, str]:
+    """
+    Build the static directory from the source assets.
+
+    Steps:
+      1. Copy every file in `assets_dir` to `static_dir` under a content-hashed name.
+      2. Write gzip (and brotli, if installed) variants next to compressible files.
+      3. Write `manifest.json` mapping logical names to hashed names.
+      4. Remove files left over from previous builds.
+
+    Returns the manifest.
+    """
+    os.makedirs(static_dir, exist_ok=True)
+    manifest: dict[str, str] = {}
+    outputs = {MANIFEST_NAME}
+
+    for name in sorted(os.listdir(assets_dir)):
+        src = os.path.join(assets_dir, name)
+        if not os.path.isfile(src):
+            continue
+        with open(src, "rb") as f:
+            content = f.read()
+
+        target = hashed_name(name, content)
+        manifest[name] = target
+        variants = {target: content}
+        if os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS:
+            # mtime=0 keeps the gzip output reproducible between builds
+            variants[target + ".gz"] = gzip.compress(content, 9, mtime=0)
+            if brotli is not None:
+                variants[target + ".br"] = brotli.compress(content)
+
+        for out_name, data in variants.items():
+            with open(os.path.join(static_dir, out_name), "wb") as f:
+                f.write(data)
+            outputs.add(out_name)
+
+    with open(os.path.join(static_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    for name in os.listdir(static_dir):
+        if name not in outputs:
+            os.remove(os.path.join(static_dir, name))
+
+    load_manifest.cache_clear()
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def load_manifest(static_dir: str = STATIC_DIR) -> dict[str, str]:
+    """
+    Return the logical name -> hashed name mapping written by `build_static`.
+    """
+    try:
+        with open(os.path.join(static_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def static_url(name: str) -> str:
+    """
+    Jinja helper: return the cache-busted URL for a static asset.
+    Raises LookupError if the asset is not in the manifest (static files not built).
+    """
+    hashed = load_manifest().get(name)
+    if hashed is None:
+        raise LookupError(
+            f"static asset {name!r} is not in {MANIFEST_NAME}; "
+            "run `python -m fastapi_admin.cli collectstatic`"
+        )
+    return STATIC_URL + hashed
+
+
+@lru_cache(maxsize=None)
+def _warn_not_vendored(name: str) -> None:
+    # once per process, so the log is not flooded on every page render
+    print(
+        f"[static] ⚠️ {name} is not vendored; loading it from "
+        f"{VENDORED_ASSETS[name][0]}. Add it to fastapi_admin/assets/ "
+        "and run collectstatic."
+    )
+
+
+def vendored_script(name: str) -> dict[str, Optional[str]]:
+    """
+    Jinja helper for third-party scripts listed in VENDORED_ASSETS.
+
+    Returns {"src": ..., "integrity": None} for the self-hosted copy. Until the
+    file has been vendored, falls back to the pinned upstream URL with its SRI
+    hash in "integrity" and logs a warning.
+    """
+    try:
+        return {"src": static_url(name), "integrity": None}
+    except LookupError:
+        _warn_not_vendored(name)
+        url, integrity = VENDORED_ASSETS[name]
+        return {"src": url, "integrity": integrity}
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Parse an Accept-Encoding header into the set of acceptable codings (q > 0).
+    """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the `.br` / `.gz` variants written by `build_static`
+    when the client accepts them, and marks content-hashed files as immutable.
+    """
+
+    def __init__(self, *, directory: str = STATIC_DIR, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.static_dir = directory
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+
+        response = None
+        has_variants = False
+        for encoding, suffix in ENCODINGS:
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, path + suffix
+            )
+            if not (stat_result and stat.S_ISREG(stat_result.st_mode)):
+                continue
+            has_variants = True
+            if response is None and encoding in accepted:
+                response = self._encoded_response(
+                    path, full_path, stat_result, encoding, request_headers
+                )
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if has_variants:
+            response.headers["vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304) and self._is_hashed(path):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def _encoded_response(
+        self,
+        path: str,
+        full_path: str,
+        stat_result: os.stat_result,
+        encoding: str,
+        request_headers: Headers,
+    ) -> Response:
+        # Content-Type must describe the original file, not the .br/.gz wrapper
+        media_type = guess_type(path)[0] or "application/octet-stream"
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers={"content-encoding": encoding},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _is_hashed(self, path: str) -> bool:
+        return path.replace(os.sep, "/") in load_manifest(self.static_dir).values()